@@ -0,0 +1,263 @@
+"""Backend client shared by `app.py` and `pages/`.
+
+Both pages read mentions through `get_mentions`, which always calls the cached
+fetch the same way, so an unfiltered fetch on one page is a cache hit on the other.
+"""
+import streamlit as st
+import requests
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeout
+from typing import List, Dict, Any, Callable
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# --- Fixed backend target (Azure) ---
+API_BASE = "https://ai-journalist-backend-gnaygteve4g8bxft.australiaeast-01.azurewebsites.net/api"
+
+# Normalize API_BASE
+def _normalize_base(url: str) -> str:
+    url = url.strip()
+    if not url.startswith(("http://", "https://")):
+        url = "https://" + url
+    if not url.rstrip("/").endswith("/api"):
+        url = url.rstrip("/") + "/api"
+    return url.rstrip("/")
+
+API_BASE = _normalize_base(API_BASE)
+
+# Connect timeout for every call (read timeouts stay per call): an unreachable
+# backend fails in ~3s instead of holding the script for the full read budget
+CONNECT_TIMEOUT = 3.05
+
+DEFAULT_ADMIN_TOKEN = os.environ.get("ADMIN_API_TOKEN", "1")
+
+# Shared HTTP session: keep-alive + pooled connections to the backend.
+# One session per admin token, carried in its headers: admin calls don't rebuild them per
+# request, and a token typed into one browser session never rides on another user's requests.
+# The default is token-less, for reads; admin calls pass their token explicitly.
+@st.cache_resource(max_entries=8)
+def get_session(admin_token: str = "") -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        # connect=0: a connect failure isn't retried, so CONNECT_TIMEOUT bounds an unreachable backend
+        max_retries=Retry(total=2, connect=0, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({"Content-Type": "application/json", "User-Agent": "ai-journalist-frontend/1.0"})
+    if admin_token:
+        s.headers["x-admin-token"] = admin_token
+    return s
+
+def run_concurrently(calls: Dict[str, Callable[[], Any]], max_workers: int = None) -> Dict[str, Future]:
+    """Start independent backend calls in parallel; returns futures keyed like `calls`.
+
+    Doesn't wait: callers `.result()` each future where it's consumed, so early results render first.
+    """
+    ctx = get_script_run_ctx()
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, min(len(calls), max_workers or len(calls))),
+        initializer=add_script_run_ctx,
+        initargs=(None, ctx),
+    )
+    futures = {name: pool.submit(fn) for name, fn in calls.items()}
+    pool.shutdown(wait=False)
+    return futures
+
+def result_within(future: Future, timeout: float) -> Any:
+    """`future.result()` if it lands within `timeout` seconds, else None (the call keeps running)."""
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        return None
+
+def cache_window(seconds: int = 60) -> int:
+    """Time bucket for disk-persisted caches (Streamlit ignores ttl when persist="disk")."""
+    return int(time.time() // seconds)
+
+@lru_cache(maxsize=4096)  # The same links come back on every refetch of the mentions list
+def domain_from_url(url: str | None) -> str:
+    """Extract clean domain from URL."""
+    if not url:
+        return "unknown"
+    try:
+        # removeprefix, not lstrip: lstrip("www.") strips any leading w/. chars ("wapo.com" → "apo.com")
+        return urlparse(url).netloc.lower().removeprefix("www.") or "unknown"
+    except ValueError:
+        return "unknown"
+
+# Defaults for mention fields the backend may omit
+MENTION_DEFAULTS = {
+    "summary": "",
+    "sentiment": "neutral",
+    "sentiment_confidence": 0.0,
+    "risk_score": 0.0,
+    "id": 0,
+    "article_id": 0,
+    "flagged": False,
+    "flag_reason": "",
+    "flagged_at": None,
+}
+
+def normalize_mention(d: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten the nested article and fill defaults in a single dict build.
+
+    The nested `article` is dropped once flattened, so cached rows (and the disk pickle) stay flat.
+    """
+    article = d.pop("article", None) or {}
+    link = article.get("link", "")
+    raw_summary = d.get("summary") or ""
+    return {
+        **MENTION_DEFAULTS,
+        **d,
+        "title": article.get("title", "(untitled)"),
+        "link": link,
+        "source": article.get("source") or domain_from_url(link),
+        # Some feeds put the article URL in the summary field
+        "summary": "(No summary available)" if raw_summary.startswith(("http://", "https://")) else raw_summary,
+        "raw_summary": raw_summary,  # Debug field
+    }
+
+ETAG_STORE_SIZE = 64  # Same bound as fetch_mentions' max_entries
+
+@st.cache_resource
+def etag_store() -> tuple:
+    """LRU of (url, params) → (ETag, normalized mentions) from the last 200, with its lock.
+
+    Process-wide and filled from worker threads, so it is bounded and guarded.
+    """
+    return OrderedDict(), threading.Lock()
+
+def get_mentions_revalidated(url: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """GET mentions with If-None-Match; a 304 reuses the stored payload without parsing."""
+    key = (url, tuple(sorted(params.items())))
+    etags, lock = etag_store()
+    with lock:
+        stored = etags.get(key)
+        if stored:
+            etags.move_to_end(key)
+    r = get_session().get(
+        url,
+        params=params,
+        headers={"If-None-Match": stored[0]} if stored else None,
+        timeout=(CONNECT_TIMEOUT, 15),
+    )
+    if r.status_code == 304 and stored:
+        return stored[1]
+    r.raise_for_status()
+    data = [normalize_mention(d) for d in orjson.loads(r.content)]
+    if r.headers.get("ETag"):
+        with lock:
+            etags[key] = (r.headers["ETag"], data)
+            etags.move_to_end(key)
+            while len(etags) > ETAG_STORE_SIZE:
+                etags.popitem(last=False)
+    return data
+
+@st.cache_data(persist="disk", max_entries=64, show_spinner=False)
+def fetch_mentions(limit: int = 50, sources: tuple = (), sentiment: str = None, flagged: bool = None, q: str = None, *, window: int) -> List[Dict[str, Any]]:
+    """Fetch mentions from backend with filters. Persisted to disk per filter combination and `window`.
+
+    Errors raise (and so are not cached); pass canonical filter values so equivalent UI states share an entry.
+    """
+    url = f"{API_BASE}/mentions"
+    params = {"limit": limit}
+    if sources:
+        params["source"] = ",".join(sources)
+    if sentiment:
+        params["sentiment"] = sentiment
+    if flagged is not None:
+        params["flagged"] = flagged
+    if q:
+        params["q"] = q
+    try:
+        return get_mentions_revalidated(url, params)
+    except requests.HTTPError as e:
+        if "q" not in params or e.response is None or e.response.status_code not in (400, 422):
+            raise
+        # Backend doesn't understand `q` — fall back to client-side search
+        params.pop("q")
+        return get_mentions_revalidated(url, params)
+
+# Largest "Items to show" on either page: both fetch this many and slice client-side
+MAX_LIMIT = 100
+
+def get_mentions(sources: tuple = (), sentiment: str = None, flagged: bool = None, q: str = None) -> List[Dict[str, Any]]:
+    """`fetch_mentions` at MAX_LIMIT for the current `cache_window`; the one entry point for both pages.
+
+    st.cache_data keys on the arguments as passed (defaults aren't filled in), so every field goes
+    positionally here and equal filters hit the same entry from either page.
+    """
+    return fetch_mentions(MAX_LIMIT, tuple(sources), sentiment, flagged, q, window=cache_window())
+
+def flag_article(article_id: int, token: str, reason: str = "urgent") -> Dict[str, Any]:
+    r = get_session(token).post(
+        f"{API_BASE}/flag",
+        params={"article_id": article_id, "reason": reason},
+        timeout=(CONNECT_TIMEOUT, 10),
+    )
+    r.raise_for_status()
+    return orjson.loads(r.content)
+
+def flag_many(article_ids: List[int], token: str, reason: str = "urgent") -> Dict[int, Any]:
+    """Flag articles concurrently (one round trip of wall time, not one per id).
+
+    Maps each article id to its /flag payload, or to the exception it raised.
+    """
+    futures = run_concurrently({aid: (lambda aid=aid: flag_article(aid, token, reason)) for aid in article_ids})
+    return {aid: fut.exception() or fut.result() for aid, fut in futures.items()}
+
+def post_ingest(body: Dict[str, Any], admin_token: str, endpoint: str = "ingest", read_timeout: float = 120) -> Dict[str, Any]:
+    """POST an ingest request body (to `endpoint`, e.g. ingest or ops/ingest); errors raise."""
+    r = get_session(admin_token).post(
+        f"{API_BASE}/{endpoint}",
+        data=orjson.dumps(body),  # Session already sends Content-Type: application/json
+        timeout=(CONNECT_TIMEOUT, read_timeout),
+    )
+    r.raise_for_status()
+    return orjson.loads(r.content)
+
+def fetch_matches(text: str, top_k: int = 3) -> List[Dict[str, Any]]:
+    r = get_session().get(
+        f"{API_BASE}/match",
+        params={"text": text, "top_k": top_k},
+        timeout=(CONNECT_TIMEOUT, 10)
+    )
+    r.raise_for_status()
+    return orjson.loads(r.content)
+
+def match_many(texts: Dict[Any, str], top_k: int = 3, max_workers: int = 8) -> Dict[Any, Any]:
+    """/match for many texts at once, at most `max_workers` in flight.
+
+    Maps each key of `texts` to its matches, or to the exception it raised.
+    """
+    futures = run_concurrently(
+        {key: (lambda text=text: fetch_matches(text, top_k)) for key, text in texts.items()},
+        max_workers=max_workers,
+    )
+    return {key: fut.exception() or fut.result() for key, fut in futures.items()}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_health() -> Dict[str, Any]:
+    """Backend /health payload, cached for 30s. Errors are returned, not raised, so they cache too.
+
+    Tight 2s timeout: a dead backend should read as down quickly, not stall the probe.
+    """
+    try:
+        return orjson.loads(get_session().get(f"{API_BASE}/health", timeout=2).content)
+    except Exception as e:
+        return {"status": "down", "error": str(e)}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_stats() -> Dict[str, Any]:
+    """Backend /stats payload, cached for 30s; errors raise and are not cached."""
+    return orjson.loads(get_session().get(f"{API_BASE}/stats", timeout=(CONNECT_TIMEOUT, 5)).content)
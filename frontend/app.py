@@ -1,75 +1,117 @@
 import streamlit as st
 import requests
-import pandas as pd
-import os
+import orjson
+import re
 import time
-from typing import List, Dict, Any
+from concurrent.futures import as_completed
+from typing import List, Dict, Any, Callable
+from _api import API_BASE, CONNECT_TIMEOUT, DEFAULT_ADMIN_TOKEN, MAX_LIMIT, get_session, run_concurrently, result_within, fetch_mentions, get_mentions, post_ingest, fetch_matches, flag_many, match_many, get_health, get_stats
 
-# --- Fixed backend target (Azure) ---
-API_BASE = "https://ai-journalist-backend-gnaygteve4g8bxft.australiaeast-01.azurewebsites.net/api"
-ADMIN_TOKEN = os.environ.get("ADMIN_API_TOKEN", "1")
-
-# Normalize API_BASE
-def _normalize_base(url: str) -> str:
-    url = url.strip()
-    if not url.startswith(("http://", "https://")):
-        url = "https://" + url
-    if not url.rstrip("/").endswith("/api"):
-        url = url.rstrip("/") + "/api"
-    return url.rstrip("/")
-
-API_BASE = _normalize_base(API_BASE)
+ADMIN_TOKEN = DEFAULT_ADMIN_TOKEN
 
 st.set_page_config(page_title="AI Journalist — Dashboard", layout="wide")
+
 st.title("📰 AI Journalist")
 
 # Sidebar: Connection & Status
 st.sidebar.header("📊 Status")
-try:
-    health = requests.get(f"{API_BASE}/health", timeout=5).json()
-    st.sidebar.markdown(f"**Backend:** {'🟢 Healthy' if health['status'] == 'ok' else '🔴 Down'}")
-except Exception as e:
-    st.sidebar.markdown(f"**Backend:** 🔴 Down ({str(e)})")
+health_slot = st.sidebar.empty()
 st.sidebar.code(API_BASE, language="text")
 admin_token_input = st.sidebar.text_input("Admin token (optional)", value=ADMIN_TOKEN, type="password")
 if admin_token_input:
     ADMIN_TOKEN = admin_token_input
 
 # --- Helpers ---
-@st.cache_data(ttl=60)
-def fetch_mentions(limit: int = 50, source: str = None, sentiment: str = None, flagged: bool = None) -> List[Dict[str, Any]]:
-    """Fetch mentions from backend with filters. Cached for 60s."""
-    url = f"{API_BASE}/mentions"
-    params = {"limit": limit}
-    if source:
-        params["source"] = source
-    if sentiment and sentiment != "All":
-        params["sentiment"] = sentiment.lower()
-    if flagged is not None:
-        params["flagged"] = flagged
+def ingest_keywords(keywords: List[str], per_keyword_limit: int, limit: int = 50) -> Dict[str, Any]:
+    return post_ingest(
+        {"keywords": keywords, "per_keyword_limit": per_keyword_limit, "limit": limit},
+        ADMIN_TOKEN,
+        read_timeout=60,
+    )
+
+def ingest_keywords_parallel(
+    keywords: List[str],
+    per_keyword_limit: int,
+    max_workers: int = 8,
+    on_result: Callable[[str, Dict[str, Any]], None] = None,
+) -> Dict[str, Any]:
+    """One /ingest per keyword on a worker pool, merged into a single outcome.
+
+    `on_result(keyword, outcome)` is called from the script thread as each keyword finishes.
+    """
+    futures = run_concurrently(
+        {kw: (lambda kw=kw: ingest_keywords([kw], per_keyword_limit, limit=per_keyword_limit)) for kw in keywords},
+        max_workers=max_workers,
+    )
+    keyword_of = {fut: kw for kw, fut in futures.items()}
+    outcomes = []
+    for fut in as_completed(keyword_of):
+        outcomes.append(fut.result())
+        if on_result:
+            on_result(keyword_of[fut], outcomes[-1])
+    failed = [o for o in outcomes if o.get("status") != "success"]
+    return {
+        "status": "success" if not failed else "error",
+        "inserted": sum(o.get("inserted", 0) for o in outcomes),
+        "message": failed[0].get("message", "Unknown error") if failed else "",
+    }
+
+def mentions_marker(timeout: Any = 1) -> Any:
+    """(id, created_at) of the newest mention — snapshot it before a write. None if unreadable."""
     try:
-        r = requests.get(url, params=params, timeout=10)
+        r = get_session().get(f"{API_BASE}/mentions", params={"limit": 1}, timeout=timeout)
         r.raise_for_status()
-        data = r.json()
-        # Handle nested article structure
-        for d in data:
-            article = d.get("article", {})
-            d["title"] = article.get("title", "(untitled)")
-            d["url"] = article.get("link", "")
-            d["source"] = article.get("source", "Unknown")
-            d["summary"] = d.get("summary", "")
-            d["sentiment"] = d.get("sentiment", "neutral")
-            d["sentiment_confidence"] = d.get("sentiment_confidence", 0.0)
-            d["risk_score"] = d.get("risk_score", 0.0)
-            d["id"] = d.get("id", 0)
-            d["article_id"] = d.get("article_id", 0)
-            d["flagged"] = d.get("flagged", False)
-            d["flag_reason"] = d.get("flag_reason", "")
-            d["flagged_at"] = d.get("flagged_at", None)
-        return data
-    except Exception as e:
-        st.session_state.setdefault("_fetch_error", str(e))
-        return []
+        rows = orjson.loads(r.content)
+    except (requests.RequestException, ValueError):
+        return None
+    return (rows[0].get("id"), rows[0].get("created_at")) if rows else ()
+
+def wait_for_mentions_update(before: Any, timeout: float = 2.0, interval: float = 0.1):
+    """Poll /mentions?limit=1 until the newest mention differs from `before` (bounded), instead of a fixed sleep.
+
+    Returns at once if either marker can't be read, so a failing backend never holds the rerun.
+    """
+    if before is None:
+        return
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        # Each poll only gets the time left, so a slow backend can't stretch the bound
+        remaining = max(0.1, deadline - time.monotonic())
+        marker = mentions_marker(timeout=(min(CONNECT_TIMEOUT, remaining), remaining))
+        if marker is None or marker != before:
+            return
+        time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+
+def invalidate_mentions():
+    """Drop cached mentions, stats/health and the per-id lowercase lookups derived from them."""
+    fetch_mentions.clear()
+    get_stats.clear()
+    get_health.clear()
+    st.session_state.pop("_lowered", None)
+
+def pushed_filters() -> Dict[str, Any]:
+    """Filter widget values from the last run; all but `limit` are pushed down to /mentions."""
+    query = (st.session_state.get("f_query") or "").strip()
+    sentiment = st.session_state.get("f_sentiment", "All")
+    return {
+        "limit": int(st.session_state.get("f_limit", 25)),
+        # Canonical values (None = no filter) so equivalent UI states share one cache entry
+        "sentiment": None if sentiment == "All" else sentiment.strip().lower(),
+        "flagged": True if st.session_state.get("f_flagged") else None,
+        # Multi-term (comma-separated) searches are matched client-side only
+        "q": query if query and "," not in query else None,
+    }
+
+def clear_filters():
+    for key in ("f_sentiment", "f_flagged", "f_query"):
+        st.session_state.pop(key, None)
+
+def search_pattern(terms: tuple) -> "re.Pattern[str]":
+    """One compiled alternation for all search terms, memoized per term set across reruns."""
+    patterns = st.session_state.setdefault("_search_patterns", {})
+    if terms not in patterns:
+        patterns[terms] = re.compile("|".join(map(re.escape, terms)))
+    return patterns[terms]
 
 def try_toast(msg: str):
     try:
@@ -77,9 +119,190 @@ def try_toast(msg: str):
     except Exception:
         st.info(msg)
 
+@st.fragment
+def render_mentions(rows: List[Dict[str, Any]]):
+    """Pagination, table, row details and actions; page flips and clicks here rerun only this fragment."""
+    per_page = st.selectbox("Per page", [5, 10, 20], index=1)
+    max_page = max(1, (len(rows) - 1) // per_page + 1)
+    page = st.number_input("Page", min_value=1, max_value=max_page, value=1, step=1)
+    start = (page - 1) * per_page
+    page_rows = rows[start:start + per_page]
+    # Resolve journalist suggestions for the whole page in one parallel batch
+    suggestions = st.session_state.setdefault("_suggestions", {})
+    if st.button("🎯 Suggest journalists for this page"):
+        results = match_many({row["id"]: row["title"] + " " + row["summary"] for row in page_rows})
+        for mention_id, result in results.items():
+            if isinstance(result, Exception):
+                try_toast(f"Suggestion failed: {str(result)}")
+            else:
+                suggestions[mention_id] = result
+    # Display Mentions — one data_editor for the page; only the 🚩 column is editable
+    table = [
+        {
+            "title": row["title"],
+            "url": row["link"],
+            "source": row["source"],
+            "sentiment": f"{row['sentiment'].upper()} ({row['sentiment_confidence']:.2f})",
+            "risk_score": row["risk_score"],
+            "flagged": row["flagged"],
+            "journalist": (suggestions.get(row["id"]) or [{}])[0].get("name", ""),
+        }
+        for row in page_rows
+    ]
+    # Key on the page's ids so pending edits don't leak onto another page's rows
+    editor_key = f"mentions_editor-{hash(tuple(row['id'] for row in page_rows))}"
+    st.data_editor(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        key=editor_key,
+        disabled=["title", "url", "source", "sentiment", "risk_score", "journalist"],
+        column_config={
+            "title": st.column_config.TextColumn("Title", width="large"),
+            "url": st.column_config.LinkColumn("Link", display_text="Open"),
+            "source": "Source",
+            "sentiment": "Sentiment",
+            "risk_score": st.column_config.ProgressColumn("Risk", min_value=0.0, max_value=1.0, format="%.2f"),
+            "flagged": st.column_config.CheckboxColumn("🚩", help="Tick to flag, then apply"),
+            "journalist": "Top journalist",
+        },
+    )
+    # Newly ticked 🚩 boxes → one batch of /flag calls
+    edited_rows = st.session_state.get(editor_key, {}).get("edited_rows", {})
+    to_flag = [
+        page_rows[i]["article_id"]
+        for i, change in edited_rows.items()
+        if change.get("flagged") and not page_rows[i]["flagged"]
+    ]
+    if st.button(f"🚩 Apply flags ({len(to_flag)})", disabled=not to_flag):
+        results = flag_many(to_flag, ADMIN_TOKEN)
+        errors = [res for res in results.values() if isinstance(res, Exception)]
+        if errors:
+            try_toast(f"Flag failed: {str(errors[0])}")
+        flagged_ok = len(results) - len(errors)
+        if flagged_ok:
+            try_toast(f"✅ Flagged {flagged_ok} article(s)")
+            # No readiness poll: /flag answers once the flag is stored, and flagging adds no new mention
+            invalidate_mentions()
+            st.rerun()
+    # Row details + journalist suggestions from a single row picker
+    pick = st.selectbox(
+        "Details for",
+        options=range(len(page_rows)),
+        format_func=lambda i: page_rows[i]["title"][:100],
+        key="mentions_detail",
+    )
+    if pick is not None and pick < len(page_rows):
+        row = page_rows[pick]
+        with st.expander(f"📝 {row['title']}", expanded=True):
+            st.markdown(f"📝 **Summary**: {row['summary']}", unsafe_allow_html=True)
+            if row["flagged"]:
+                st.markdown(f"🚩 **Flagged: {row['flag_reason'] or 'urgent'}** at {row['flagged_at'] or ''}")
+            st.write(f"ID: {row['id']} • Article ID: {row['article_id']}")
+            with st.popover("🎯 Suggest journalist"):
+                # Popover bodies run on every rerun, so the /match call stays behind a button
+                if st.button("Find matches", key=f"suggest-{row['id']}"):
+                    try:
+                        suggestions[row["id"]] = fetch_matches(row["title"] + " " + row["summary"])
+                    except Exception as e:
+                        st.error(f"Suggestion failed: {str(e)}")
+                matches = suggestions.get(row["id"])
+                if matches:
+                    st.markdown(f"**🎯 Top {len(matches)} Journalist Matches**")
+                    for i, m in enumerate(matches, 1):
+                        score = m.get('score', 0)
+                        st.write(f"{i}. **{m.get('name', 'Unknown')}** ({m.get('outlet', 'Unknown')})")
+                        st.caption(f"Score: {score:.2f} | Topics: {m.get('topics', 'N/A')}")
+                elif matches is not None:
+                    st.info("No journalists found in database")
+
+def ops_ingest(endpoint: str) -> Dict[str, Any]:
+    """POST the demo Google ingest payload to `endpoint` (ingest or its ops/ingest alias)."""
+    return post_ingest(
+        {"source": "google", "limit": 10, "backfill_days": 2, "dry_run": False},
+        ADMIN_TOKEN,
+        endpoint=endpoint,
+        read_timeout=30,
+    )
+
+@st.fragment
+def render_operations():
+    """Ingest/process buttons, isolated from the Mentions tab state."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("📥 Fetch new articles (ingest)"):
+            before = mentions_marker()
+            try:
+                result = ops_ingest("ingest")
+                st.success("Ingest completed.")
+                invalidate_mentions()
+                # Nothing inserted → the newest mention won't change, so don't wait for it
+                if result.get("inserted"):
+                    wait_for_mentions_update(before)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Ingest failed: {str(e)}")
+    with col2:
+        if st.button("📝 Process mentions (temporary: re-run ingest)"):
+            before = mentions_marker()
+            try:
+                result = ops_ingest("ops/ingest")
+                st.success("Re-ingest completed.")
+                invalidate_mentions()
+                # Nothing inserted → the newest mention won't change, so don't wait for it
+                if result.get("inserted"):
+                    wait_for_mentions_update(before)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Process (alias) failed: {str(e)}")
+    with col3:
+        fetch_and_process = st.button("📥📝 Fetch + Process", type="primary")
+    if fetch_and_process:
+        # Both calls are independent — dispatch together and report each as it lands
+        before = mentions_marker()
+        labels = {"ingest": "Ingest", "ops/ingest": "Process"}
+        futures = run_concurrently({ep: (lambda ep=ep: ops_ingest(ep)) for ep in labels})
+        endpoint_of = {fut: ep for ep, fut in futures.items()}
+        succeeded = inserted = 0
+        for fut in as_completed(endpoint_of):
+            label = labels[endpoint_of[fut]]
+            with st.status(label, state="running") as status:
+                if fut.exception():
+                    status.update(label=f"{label} failed", state="error")
+                    st.error(str(fut.exception()))
+                else:
+                    succeeded += 1
+                    inserted += fut.result().get("inserted", 0)
+                    status.update(label=f"{label} completed", state="complete")
+        if succeeded:
+            invalidate_mentions()
+        # Keep a failure's status on screen; rerun only when both landed
+        if succeeded == len(futures):
+            if inserted:
+                wait_for_mentions_update(before)
+            st.rerun()
+
 # Tabs
 tab = st.sidebar.selectbox("View", ["Mentions", "Operations"])
 
+# Health, mentions and stats are independent — overlap them
+initial_calls = {"health": get_health}
+if tab == "Mentions":
+    filters = pushed_filters()
+    initial_calls["mentions"] = lambda: get_mentions(sentiment=filters["sentiment"], flagged=filters["flagged"], q=filters["q"])
+    initial_calls["stats"] = get_stats
+initial = run_concurrently(initial_calls)
+# Don't hold the page on a slow probe: it keeps running and fills the cache for the next rerun
+health = result_within(initial["health"], timeout=1.0)
+if health is None:
+    health_slot.markdown("**Backend:** 🟡 Checking…")
+elif health.get("status") == "ok":
+    health_slot.markdown("**Backend:** 🟢 Healthy")
+elif "error" in health:
+    health_slot.markdown(f"**Backend:** 🔴 Down ({health['error']})")
+else:
+    health_slot.markdown("**Backend:** 🔴 Down")
+
 # --- Mentions Tab ---
 if tab == "Mentions":
     st.header("Mentions")
@@ -97,70 +320,99 @@ if tab == "Mentions":
         value=5,
         help="Balance speed vs coverage"
     )
+    parallel_ingest = st.checkbox(
+        "Use parallel workers",
+        help="Send one request per keyword concurrently instead of a single batched request"
+    )
     if st.button("🚀 FETCH BY KEYWORDS", type="primary"):
         keywords = [kw.strip() for kw in keywords_input.split("\n") if kw.strip()]
         if keywords:
-            with st.spinner(f"Fetching articles for {len(keywords)} keywords..."):
+            before = mentions_marker()
+            with st.status(f"Fetching articles for {len(keywords)} keywords...", expanded=parallel_ingest) as status:
                 try:
-                    params = [("keywords", kw) for kw in keywords] + [("per_keyword_limit", articles_per_keyword), ("limit", 50)]
-                    headers = {"x-admin-token": ADMIN_TOKEN}
-                    r = requests.post(
-                        f"{API_BASE}/ingest",
-                        params=params,
-                        headers=headers,
-                        timeout=60
-                    )
-                    r.raise_for_status()
-                    outcome = r.json()
+                    if parallel_ingest:
+                        # Per-keyword progress as each parallel request lands
+                        progress = st.progress(0.0)
+                        finished = []
+                        def report(kw: str, result: Dict[str, Any]):
+                            finished.append(kw)
+                            progress.progress(len(finished) / len(keywords), text=f"{kw}: {result.get('inserted', 0)} new")
+                        outcome = ingest_keywords_parallel(keywords, articles_per_keyword, on_result=report)
+                    else:
+                        outcome = ingest_keywords(keywords, articles_per_keyword)
                     if outcome.get("status") == "success":
-                        st.success(f"✅ Fetched **{outcome['inserted']}** articles from **{len(keywords)}** keywords!")
-                        fetch_mentions.clear()
-                        time.sleep(0.5)
+                        status.update(label=f"✅ Fetched {outcome['inserted']} articles from {len(keywords)} keywords", state="complete")
+                        invalidate_mentions()
+                        # Nothing inserted → the newest mention won't change, so don't wait for it
+                        if outcome.get("inserted"):
+                            wait_for_mentions_update(before)
                         st.rerun()
                     else:
+                        status.update(label="Ingest failed", state="error")
                         st.error(f"❌ Ingest failed: {outcome.get('message', 'Unknown error')}")
                 except requests.exceptions.Timeout:
+                    status.update(label="Ingest timed out", state="error")
                     st.error("❌ Request timed out. Try fewer keywords or lower limit.")
                 except Exception as e:
+                    status.update(label="Ingest failed", state="error")
                     st.error(f"❌ Fetch failed: {str(e)}")
         else:
             st.error("⚠️ Please enter at least one keyword!")
     # Fetch Mentions
-    mentions = fetch_mentions(limit=50)
-    fetch_error = st.session_state.pop("_fetch_error", None)
-    if fetch_error:
-        st.error(f"Failed to fetch mentions: {fetch_error}")
+    try:
+        # Fetched at MAX_LIMIT (shared with the Mentions page cache); "Items to show" slices it
+        mentions = initial["mentions"].result()[:filters["limit"]]
+    except Exception as e:
+        st.error(f"Failed to fetch mentions: {str(e)}")
+        mentions = []
     if not mentions:
-        st.info("No mentions found. Try the 'Dynamic Keyword Search' above!")
+        if filters["sentiment"] or filters["flagged"] or filters["q"]:
+            st.info("No mentions match the current filters.")
+            st.button("Clear filters", on_click=clear_filters)
+        else:
+            st.info("No mentions found. Try the 'Dynamic Keyword Search' above!")
         st.stop()
-    # Convert to DataFrame
-    df = pd.DataFrame(mentions)
     # Dynamically get unique sources
-    unique_sources = sorted([s for s in df['source'].dropna().unique() if s and s != "Unknown"])
+    unique_sources = sorted({m["source"] for m in mentions if m["source"] and m["source"] != "unknown"})
     # Filters
     st.subheader("🔍 Filters")
-    col1, col2 = st.columns(2)
-    with col1:
-        limit = st.number_input("Items to show", min_value=10, max_value=100, value=25)
-    with col2:
-        source_filter = st.multiselect("Filter sources", options=unique_sources, default=[])
-    col3, col4 = st.columns(2)
-    with col3:
-        sentiment_filter = st.selectbox("Sentiment", options=["All", "Positive", "Negative", "Neutral"], index=0)
-    with col4:
-        flagged_filter = st.checkbox("Show flagged articles only")
-    # Apply Filters
-    filtered_df = df.copy()
-    if source_filter:
-        filtered_df = filtered_df[filtered_df['source'].isin(source_filter)]
-    if sentiment_filter != "All":
-        filtered_df = filtered_df[filtered_df['sentiment'] == sentiment_filter.lower()]
-    if flagged_filter:
-        filtered_df = filtered_df[filtered_df['flagged'] == True]
+    # Form: typing/toggling doesn't rerun the script until "Apply" is pressed
+    with st.form("filters"):
+        col1, col2 = st.columns(2)
+        with col1:
+            # Applied to the MAX_LIMIT fetch on the next run, like the other filters
+            st.number_input("Items to show", min_value=10, max_value=MAX_LIMIT, value=25, key="f_limit")
+        with col2:
+            source_filter = st.multiselect("Filter sources", options=unique_sources, default=[])
+        col3, col4 = st.columns(2)
+        with col3:
+            sentiment_filter = st.selectbox("Sentiment", options=["All", "Positive", "Negative", "Neutral"], index=0, key="f_sentiment")
+        with col4:
+            flagged_filter = st.checkbox("Show flagged articles only", key="f_flagged")
+        query = st.text_input("Search title/summary", placeholder="e.g. election, budget", help="Comma-separated terms match any", key="f_query")
+        st.form_submit_button("Apply")
+    # Apply Filters (already pushed to the backend; re-applied here since it may ignore unknown params)
+    # Plain list filtering: ≤100 dicts is cheaper in Python than building a DataFrame
+    allowed_sources = set(source_filter)
+    wanted_sentiment = sentiment_filter.lower()
+    terms = tuple(sorted({t.strip().lower() for t in query.split(",") if t.strip()}))
+    pattern = search_pattern(terms) if terms else None
+    # Lowercased title/summary memoized across reruns by mention id
+    lowered = st.session_state.setdefault("_lowered", {})
+    for m in mentions:
+        if m["id"] not in lowered:
+            lowered[m["id"]] = ((m["title"] or "").lower(), (m["summary"] or "").lower())
+    filtered = [
+        m for m in mentions
+        if (not allowed_sources or m["source"] in allowed_sources)
+        and (sentiment_filter == "All" or m["sentiment"] == wanted_sentiment)
+        and (not flagged_filter or m["flagged"])
+        and (not pattern or pattern.search(lowered[m["id"]][0]) or pattern.search(lowered[m["id"]][1]))
+    ]
     # Stats
     try:
-        stats = requests.get(f"{API_BASE}/stats", timeout=5).json()
-        st.subheader(f"🗞️ Latest Mentions ({len(filtered_df)} shown)")
+        stats = initial["stats"].result()
+        st.subheader(f"🗞️ Latest Mentions ({len(filtered)} shown)")
         st.markdown(f"**Total Mentions:** {stats['total_mentions']}")
         st.markdown(f"**Unique Sources:** {len(unique_sources)}")
         st.markdown(f"**Positive:** {stats['sentiment_distribution'].get('positive', 0)}")
@@ -168,73 +420,7 @@ if tab == "Mentions":
         st.markdown(f"**Avg Risk:** {sum(m['risk_score'] for m in mentions) / len(mentions) if mentions else 0:.2f}")
     except Exception as e:
         st.error(f"Failed to fetch stats: {str(e)}")
-    # Pagination
-    per_page = st.selectbox("Per page", [5, 10, 20], index=1)
-    max_page = max(1, (len(filtered_df) - 1) // per_page + 1)
-    page = st.number_input("Page", min_value=1, max_value=max_page, value=1, step=1)
-    start = (page - 1) * per_page
-    end = start + per_page
-    page_df = filtered_df.iloc[start:end]
-    # Display Mentions
-    for _, row in page_df.iterrows():
-        st.markdown("---")
-        title = row["title"]
-        url = row["url"]
-        source = row["source"]
-        risk_score = row["risk_score"]
-        # Color-coded risk badge
-        risk_color = "red" if risk_score >= 0.7 else "orange" if risk_score >= 0.4 else "green"
-        risk_label = f"<span style='color: {risk_color};'>●</span> Risk: {risk_score:.2f}"
-        if url and title:
-            clean_title = title[:100] + "..." if len(title) > 100 else title
-            st.markdown(f"[{clean_title}]({url}) <font color='#6f6f6f'>{source}</font>", unsafe_allow_html=True)
-        else:
-            st.markdown(f"{title or '(untitled)'} <font color='#6f6f6f'>{source}</font>", unsafe_allow_html=True)
-        st.markdown(f"📝 **Summary**: {row['summary']}", unsafe_allow_html=True)
-        st.markdown(f"**Sentiment**: {row['sentiment'].upper()} ({row['sentiment_confidence']:.2f}) • **{risk_label}** • **Source**: {source}", unsafe_allow_html=True)
-        if row.get("flagged", False):
-            st.markdown(f"🚩 **Flagged: {row.get('flag_reason', 'urgent')}** at {row.get('flagged_at', '')}")
-        cols = st.columns([1, 1, 6])
-        with cols[0]:
-            # Flag Button
-            if st.button("🚩 Flag", key=f"flag-{row['id']}", disabled=row.get("flagged", False)):
-                try:
-                    r = requests.post(
-                        f"{API_BASE}/flag",
-                        params={"article_id": row['article_id'], "reason": "urgent"},
-                        headers={"x-admin-token": ADMIN_TOKEN},
-                        timeout=10
-                    )
-                    r.raise_for_status()
-                    try_toast(f"✅ Flagged: {r.json()['reason']}")
-                    fetch_mentions.clear()
-                    time.sleep(0.3)
-                    st.rerun()
-                except Exception as e:
-                    try_toast(f"Flag failed: {str(e)}")
-        with cols[1]:
-            # Suggest Journalist Button
-            if st.button("🎯 Suggest journalist", key=f"suggest-{row['id']}"):
-                try:
-                    r = requests.get(
-                        f"{API_BASE}/match",
-                        params={"text": row['title'] + " " + row['summary'], "top_k": 3},
-                        timeout=10
-                    )
-                    r.raise_for_status()
-                    matches = r.json()
-                    if matches:
-                        with st.expander(f"🎯 Top {len(matches)} Journalist Matches", expanded=True):
-                            for i, m in enumerate(matches, 1):
-                                score = m.get('score', 0)
-                                st.write(f"{i}. **{m.get('name', 'Unknown')}** ({m.get('outlet', 'Unknown')})")
-                                st.caption(f"Score: {score:.2f} | Topics: {m.get('topics', 'N/A')}")
-                    else:
-                        try_toast("No journalists found in database")
-                except Exception as e:
-                    try_toast(f"Suggestion failed: {str(e)}")
-        with cols[2]:
-            st.write(f"ID: {row['id']} • Article ID: {row['article_id']}")
+    render_mentions(filtered)
     st.markdown("---")
     st.caption("Azure demo — powered by AI Journalist API")
 
@@ -243,48 +429,11 @@ elif tab == "Operations":
     st.header("⚙️ Operations")
     if not ADMIN_TOKEN:
         st.info("Admin token not set — proceeding (backend does not enforce it).")
-    col1, col2 = st.columns(2)
-    with col1:
-        if st.button("📥 Fetch new articles (ingest)"):
-            try:
-                r = requests.post(
-                    f"{API_BASE}/ingest",
-                    headers={
-                        "Content-Type": "application/json",
-                        **({"x-admin-token": ADMIN_TOKEN} if ADMIN_TOKEN else {}),
-                    },
-                    json={"source": "google", "limit": 10, "backfill_days": 2, "dry_run": False},
-                    timeout=30,
-                )
-                r.raise_for_status()
-                st.success("Ingest completed.")
-                fetch_mentions.clear()
-                time.sleep(0.3)
-                st.rerun()
-            except Exception as e:
-                st.error(f"Ingest failed: {str(e)}")
-    with col2:
-        if st.button("📝 Process mentions (temporary: re-run ingest)"):
-            try:
-                r = requests.post(
-                    f"{API_BASE}/ops/ingest",
-                    headers={
-                        "Content-Type": "application/json",
-                        **({"x-admin-token": ADMIN_TOKEN} if ADMIN_TOKEN else {}),
-                    },
-                    json={"source": "google", "limit": 10, "backfill_days": 2, "dry_run": False},
-                    timeout=30,
-                )
-                r.raise_for_status()
-                st.success("Re-ingest completed.")
-                fetch_mentions.clear()
-                time.sleep(0.3)
-                st.rerun()
-            except Exception as e:
-                st.error(f"Process (alias) failed: {str(e)}")
+    render_operations()
     st.markdown("### Quick workflow")
     st.write("""
     1. Click **Fetch new articles (ingest)** to create/update demo data.
     2. The **Process** button re-runs ingest until a real `/process` API exists.
+       **Fetch + Process** sends both at once.
     3. Switch to **Mentions** to see results.
     """)
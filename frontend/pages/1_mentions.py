@@ -1,110 +1,150 @@
 import streamlit as st
 import requests
+import numpy as np
 import pandas as pd
-import os
-from urllib.parse import urlparse
-import plotly.express as px
-from datetime import datetime, timedelta
 import time
+import html
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from _api import DEFAULT_ADMIN_TOKEN, MAX_LIMIT, run_concurrently, result_within, fetch_mentions, get_mentions, post_ingest, fetch_matches, flag_article, match_many, get_health
 
 # Page config
 st.set_page_config(page_title="📰 Mentions", layout="wide")
 
-# Backend URL from session state (set in app.py sidebar)
-BACKEND = st.session_state.get(
-    "backend_url",
-    "https://ai-journalist-backend-gnaygteve4g8bxft.australiaeast-01.azurewebsites.net"
-)
-ADMIN_TOKEN = st.session_state.get("admin_token", os.environ.get("ADMIN_API_TOKEN", "1"))
+ADMIN_TOKEN = st.session_state.get("admin_token", DEFAULT_ADMIN_TOKEN)
+
+# Health probe runs in the background while the page fetches mentions
+health_future = run_concurrently({"health": get_health})["health"]
 
 # ─────────────────────────────
 # UTILITY FUNCTIONS
 # ─────────────────────────────
-@st.cache_data(ttl=60)  # Cache 60 seconds
-def fetch_mentions(limit=50, sources=None, sentiment=None, flagged=None):
-    """Fetch mentions from backend API with filters."""
+def load_mentions():
+    """Unfiltered `get_mentions` (shared with the dashboard cache), reporting errors instead of raising."""
     try:
-        params = {"limit": limit}
-        if sources:
-            params["source"] = ",".join(sources)
-        if sentiment and sentiment != "All":
-            params["sentiment"] = sentiment.lower()
-        if flagged is not None:
-            params["flagged"] = flagged
-        resp = requests.get(
-            f"{BACKEND}/api/mentions",
-            params=params,
-            headers={"User-Agent": "Streamlit/1.0"},
-            timeout=15
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        # Normalize data
-        for m in data:
-            article = m.get("article", {})
-            m["title"] = article.get("title", "(untitled)")
-            m["link"] = article.get("link", "")
-            m["source"] = article.get("source") or domain_from_url(m["link"])
-            raw_summary = m.get("summary", "")
-            # Check if summary is a URL
-            m["summary"] = "(No summary available)" if raw_summary.startswith(("http://", "https://")) else raw_summary
-            m["raw_summary"] = raw_summary  # Debug field
-            m["sentiment"] = m.get("sentiment", "neutral")
-            m["sentiment_confidence"] = m.get("sentiment_confidence", 0.0)
-            m["risk_score"] = m.get("risk_score", 0.0)
-            m["id"] = m.get("id", 0)
-            m["article_id"] = m.get("article_id", 0)
-            m["flagged"] = m.get("flagged", False)
-            m["flag_reason"] = m.get("flag_reason", "")
-            m["flagged_at"] = m.get("flagged_at", None)
-        return data
+        return get_mentions()
     except requests.exceptions.RequestException as e:
         st.error(f"❌ Failed to fetch mentions: {e}")
-        return []
     except Exception as e:
         st.error(f"❌ Unexpected error: {e}")
-        return []
+    return []
 
-# ✅ FIXED VERSION — JSON body ingestion
-def ingest_by_keywords(keywords, per_keyword_limit=5):
-    """Dynamic ingestion by user keywords (JSON BODY)."""
-    try:
-        payload = {
+@st.cache_data(ttl=300, show_spinner=False)
+def _ingest_cached(keywords, per_keyword_limit, admin_token, _keywords):
+    """POST /ingest (JSON body) once per canonical keyword set; repeats within 5 min reuse the result.
+
+    `keywords` (canonical) is only the cache key; the backend gets `_keywords` as typed (unhashed).
+    Errors raise, so a failed ingest is never cached.
+    """
+    return post_ingest(
+        {
             "source": "google",
-            "keywords": keywords,
+            "keywords": list(_keywords),
             "per_keyword_limit": per_keyword_limit
-        }
-        headers = {
-            "x-admin-token": ADMIN_TOKEN,
-            "Content-Type": "application/json"
-        }
-        resp = requests.post(
-            f"{BACKEND}/api/ingest",
-            json=payload,
-            headers=headers,
-            timeout=120
+        },
+        admin_token,
+    )
+
+def start_keyword_ingest(keywords, per_keyword_limit=5):
+    """Run a keyword ingest on this session's background worker; the page stays usable meanwhile.
+
+    "AI\nOpenAI" and "openai\nai" share one cache entry. Progress is shown by `render_ingest_status`.
+    """
+    if "ingest_executor" not in st.session_state:
+        st.session_state.ingest_executor = ThreadPoolExecutor(
+            max_workers=2,
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx()),
         )
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        st.error(f"❌ Keyword ingest failed: {e}")
-        return None
+    canonical = tuple(sorted({kw.strip().lower() for kw in keywords if kw.strip()}))
+    args = (canonical, per_keyword_limit, ADMIN_TOKEN, keywords)
+    st.session_state.pending_ingest = (st.session_state.ingest_executor.submit(_ingest_cached, *args), args, keywords)
 
-def domain_from_url(url: str | None) -> str:
-    """Extract clean domain from URL."""
-    if not url:
-        return "unknown"
+def render_ingest_status():
+    """Running badge for a pending keyword ingest; on completion, record the outcome and rerun the page."""
+    future, args, keywords = st.session_state.pending_ingest
+    if not future.done():
+        st.status(f"🔍 Fetching {len(keywords)} keywords from Google News...", state="running")
+        return
+    del st.session_state.pending_ingest
     try:
-        return urlparse(url).netloc.lower().lstrip("www.")
-    except:
-        return "unknown"
+        result = future.result()
+    except Exception as e:
+        st.session_state.ingest_notice = ("error", f"❌ Keyword ingest failed: {e}")
+        st.rerun()
+    if result.get("status") in ("success", "ok"):
+        st.session_state.ingest_notice = ("success", f"✅ Fetched **{result.get('inserted', 0)}** articles from **{len(keywords)}** keywords!")
+        st.session_state.last_keywords = keywords
+        # Only the mention reads are stale; keep the ingest cache so a repeat FETCH is instant
+        fetch_mentions.clear()
+    else:
+        # Backend-reported failure: drop just this entry so the next click retries
+        _ingest_cached.clear(*args)
+        st.session_state.ingest_notice = ("error", "❌ Fetch failed!")
+    st.rerun()
+
+# Sentiment styling
+SENTIMENT_EMOJI = {
+    "positive": "🟢",
+    "negative": "🔴",
+    "neutral": "⚪"
+}
+
+def risk_badges(risk_scores: pd.Series) -> np.ndarray:
+    """Color-coded risk labels for a whole column at once ("🟥 0.82"; "N/A" where missing)."""
+    risk = risk_scores.astype(float)
+    colors = pd.Series(np.select([risk >= 0.7, risk >= 0.4], ["🟥", "🟧"], default="🟩"), index=risk.index)
+    return np.where(risk.isna(), "N/A", colors + " " + risk.map("{:.2f}".format))
+
+# Chart builders are cached on the aggregates they plot, so any rerun (or reordering)
+# that leaves a distribution unchanged reuses the pickled figure. Plotly is imported
+# inside each builder: only paid on a cache miss, not on every rerun.
+@st.cache_data(ttl=120, show_spinner=False)
+def build_source_bar(source_counts):
+    """Top-sources bar from ((source, count), ...) pairs."""
+    import plotly.express as px
+    fig = px.bar(
+        pd.DataFrame(list(source_counts), columns=["source", "count"]),
+        x="count",
+        y="source",
+        orientation="h",
+        title="🗞️ Top Sources",
+        color="count",
+        color_continuous_scale="Viridis",
+        height=400
+    )
+    fig.update_layout(margin={"t": 40, "b": 20, "l": 0, "r": 0})
+    return fig
+
+@st.cache_data(ttl=120, show_spinner=False)
+def build_sentiment_pie(sentiment_counts):
+    """Sentiment pie from ((sentiment, count), ...) pairs."""
+    import plotly.express as px
+    return px.pie(
+        pd.DataFrame(list(sentiment_counts), columns=["sentiment", "count"]),
+        values="count",
+        names="sentiment",
+        title="😊 Sentiment Distribution",
+        color_discrete_map={
+            "positive": "#10B981",
+            "negative": "#EF4444",
+            "neutral": "#6B7280",
+            "unknown": "#9CA3AF"
+        }
+    )
 
-def format_risk(risk: float | int | None) -> str:
-    """Format risk score with color-coded emoji."""
-    if risk is None:
-        return "N/A"
-    color = "🟥" if risk >= 0.7 else "🟧" if risk >= 0.4 else "🟩"
-    return f"{color} {risk:.2f}"
+@st.cache_data(ttl=120, show_spinner=False)
+def build_risk_hist(risk_scores):
+    """Risk score histogram from a sorted float array of scores."""
+    import plotly.express as px
+    return px.histogram(
+        pd.DataFrame({"risk_score": risk_scores}),
+        x="risk_score",
+        nbins=20,
+        title="⚠️ Risk Score Distribution",
+        labels={"risk_score": "Risk Score"},
+        color_discrete_sequence=["#3B82F6"],
+    )
 
 # ─────────────────────────────
 # MAIN UI
@@ -112,53 +152,61 @@ def format_risk(risk: float | int | None) -> str:
 st.title("📰 News Mentions Monitor")
 st.markdown("**Real-time news tracking with AI sentiment & risk analysis**")
 
+# One fetch at the "Items to show" ceiling feeds the debug view, source list and main list;
+# filters and the item limit apply client-side, so widget changes never refetch
+with st.spinner("Loading latest mentions..."):
+    mentions = load_mentions()
+
 # Debug: Show raw summary for first mention
 if st.checkbox("Show raw summary (debug)"):
-    mentions_debug = fetch_mentions(limit=1)
-    if mentions_debug:
-        st.write("Raw summary (first mention):", mentions_debug[0].get("raw_summary", "N/A"))
+    if mentions:
+        st.write("Raw summary (first mention):", mentions[0].get("raw_summary", "N/A"))
 
 # ─────────────────────────────
 # SIDEBAR: FILTERS & CONTROLS
 # ─────────────────────────────
-st.sidebar.header("🔍 Dynamic Keyword Search")
-st.sidebar.markdown("**Type keywords → Fetch fresh Google News!**")
-keywords_input = st.sidebar.text_area(
-    "Keywords (one per line):",
-    value="AI\njournalism\nstartups\nclimate change\nOpenAI",
-    height=100,
-    help="Enter keywords or phrases (e.g., 'climate change'). Click FETCH to get Google News RSS!"
-)
-articles_per_keyword = st.sidebar.slider(
-    "Articles per keyword:",
-    min_value=1,
-    max_value=20,
-    value=5,
-    help="5-10 recommended for speed"
-)
+def keyword_panel():
+    """Keyword inputs + FETCH. Run as a fragment: typing or sliding here doesn't rerun the page."""
+    st.header("🔍 Dynamic Keyword Search")
+    st.markdown("**Type keywords → Fetch fresh Google News!**")
+    keywords_input = st.text_area(
+        "Keywords (one per line):",
+        value="AI\njournalism\nstartups\nclimate change\nOpenAI",
+        height=100,
+        help="Enter keywords or phrases (e.g., 'climate change'). Click FETCH to get Google News RSS!"
+    )
+    articles_per_keyword = st.slider(
+        "Articles per keyword:",
+        min_value=1,
+        max_value=20,
+        value=5,
+        help="5-10 recommended for speed"
+    )
 
-# ✅ Fixed ingestion button (JSON body)
-if st.sidebar.button("🚀 FETCH BY KEYWORDS", type="primary", use_container_width=True):
-    keywords = [kw.strip() for kw in keywords_input.split("\n") if kw.strip()]
-    if keywords:
-        with st.spinner(f"🔍 Fetching {len(keywords)} keywords from Google News..."):
-            result = ingest_by_keywords(keywords, articles_per_keyword)
-            if result and result.get("status") in ("success", "ok"):
-                inserted = result.get("inserted", 0)
-                st.sidebar.success(f"✅ Fetched **{inserted}** articles from **{len(keywords)}** keywords!")
-                st.session_state.last_keywords = keywords
-                st.cache_data.clear()
-                st.rerun()
-            else:
-                st.sidebar.error("❌ Fetch failed!")
-    else:
-        st.sidebar.error("⚠️ Enter at least one keyword!")
+    # ✅ Fixed ingestion button (JSON body) — the POST runs in the background, not on the script thread
+    ingest_pending = "pending_ingest" in st.session_state
+    if st.button("🚀 FETCH BY KEYWORDS", type="primary", use_container_width=True, disabled=ingest_pending):
+        keywords = [kw.strip() for kw in keywords_input.split("\n") if kw.strip()]
+        if keywords:
+            start_keyword_ingest(keywords, articles_per_keyword)
+            st.rerun()
+        else:
+            st.error("⚠️ Enter at least one keyword!")
+    if ingest_pending:
+        render_ingest_status()
+    notice = st.session_state.pop("ingest_notice", None)
+    if notice and notice[0] == "success":
+        st.success(notice[1])
+    elif notice:
+        st.error(notice[1])
+
+with st.sidebar:
+    # Polls every 2s only while an ingest runs; the status reruns the whole page once it lands
+    st.fragment(keyword_panel, run_every=2 if "pending_ingest" in st.session_state else None)()
 
 st.sidebar.markdown("---")
 st.sidebar.header("🔍 Filters")
-limit = st.sidebar.slider("Items to show", 10, 100, 25)
-# Dynamically fetch sources
-mentions = fetch_mentions(limit=100)  # Fetch more to get unique sources
+limit = st.sidebar.slider("Items to show", 10, MAX_LIMIT, 25)
 unique_sources = sorted({m["source"] for m in mentions if m["source"] != "unknown"})
 sources = st.sidebar.multiselect("Filter sources", options=unique_sources, default=[])
 sentiment_filter = st.sidebar.selectbox(
@@ -167,6 +215,7 @@ sentiment_filter = st.sidebar.selectbox(
     index=0
 )
 flagged_filter = st.sidebar.checkbox("Show flagged articles only")
+bulk_suggest = st.sidebar.checkbox("Bulk suggest for visible mentions", help="One concurrent batch of /match calls instead of one per click")
 if st.sidebar.button("🔄 Refresh Data", use_container_width=True):
     st.cache_data.clear()
     st.rerun()
@@ -175,13 +224,7 @@ st.sidebar.markdown("---")
 st.sidebar.subheader("🚀 Quick Actions")
 if st.sidebar.button("🎭 Ingest Demo Data", use_container_width=True):
     try:
-        resp = requests.post(
-            f"{BACKEND}/api/ingest",
-            json={"source": "demo", "limit": 5},
-            headers={"x-admin-token": ADMIN_TOKEN},
-            timeout=30
-        )
-        resp.raise_for_status()
+        post_ingest({"source": "demo", "limit": 5}, ADMIN_TOKEN, read_timeout=30)
         st.sidebar.success("✅ Demo data loaded!")
         st.cache_data.clear()
         st.rerun()
@@ -190,19 +233,16 @@ if st.sidebar.button("🎭 Ingest Demo Data", use_container_width=True):
 
 if st.sidebar.button("🌐 Legacy Google News", use_container_width=True):
     try:
-        resp = requests.post(
-            f"{BACKEND}/api/ingest",
-            json={
+        result = post_ingest(
+            {
                 "source": "google",
                 "keywords": ["AI", "journalism", "technology"],
                 "limit": 20,
                 "per_keyword_limit": 5
             },
-            headers={"x-admin-token": ADMIN_TOKEN},
-            timeout=90
+            ADMIN_TOKEN,
+            read_timeout=90,
         )
-        resp.raise_for_status()
-        result = resp.json()
         st.sidebar.success(f"✅ Legacy ingest: {result.get('inserted', 0)} articles!")
         st.cache_data.clear()
         st.rerun()
@@ -211,21 +251,20 @@ if st.sidebar.button("🌐 Legacy Google News", use_container_width=True):
 
 st.sidebar.markdown("---")
 st.sidebar.subheader("📊 Status")
-try:
-    health_resp = requests.get(f"{BACKEND}/api/health", timeout=5)
-    if health_resp.status_code == 200:
-        st.sidebar.success("🟢 Backend: Healthy")
-    else:
-        st.sidebar.error("🔴 Backend: Unhealthy")
-except:
+# Don't hold the sidebar on a slow probe: it keeps running and fills the cache for the next rerun
+health = result_within(health_future, timeout=1.0)
+if health is None:
+    st.sidebar.info("🟡 Backend: Checking…")
+elif health.get("status") == "ok":
+    st.sidebar.success("🟢 Backend: Healthy")
+elif "error" in health:
     st.sidebar.error("🔴 Backend: Unreachable")
+else:
+    st.sidebar.error("🔴 Backend: Unhealthy")
 
 # ─────────────────────────────
-# DATA FETCHING & PROCESSING
+# DATA PROCESSING
 # ─────────────────────────────
-with st.spinner("Loading latest mentions..."):
-    mentions = fetch_mentions(limit=limit, sources=sources, sentiment=sentiment_filter, flagged=flagged_filter)
-
 if not mentions:
     st.warning("📭 **No mentions found**")
     st.info("""
@@ -237,18 +276,30 @@ if not mentions:
     """)
     st.stop()
 
-# Apply filters
-filtered_mentions = mentions.copy()
+# Apply filters — one DataFrame, one boolean mask over the single fetch, then "Items to show"
+df = pd.DataFrame(mentions)
+mask = np.ones(len(df), dtype=bool)
+if sources:
+    mask &= df["source"].isin(set(sources)).to_numpy()
+if sentiment_filter != "All":
+    mask &= df["sentiment"].to_numpy() == sentiment_filter.lower()
+if flagged_filter:
+    mask &= df["flagged"].to_numpy(dtype=bool)
+fdf = df[mask].head(limit)
+filtered_mentions = [mentions[i] for i in fdf.index]
 
 # ─────────────────────────────
 # METRICS DASHBOARD
 # ─────────────────────────────
 col1, col2, col3, col4, col5 = st.columns(5)
-total_mentions = len(filtered_mentions)
-unique_sources = len({m["source"] for m in filtered_mentions if m["source"] != "unknown"})
-positive_count = sum(1 for m in filtered_mentions if m["sentiment"] == "positive")
-negative_count = sum(1 for m in filtered_mentions if m["sentiment"] == "negative")
-avg_risk = sum(m["risk_score"] for m in filtered_mentions) / max(total_mentions, 1)
+# Metrics as NumPy reductions on raw column arrays (skips pandas' per-op Series wrapping)
+sentiment_values = fdf["sentiment"].to_numpy()
+source_values = fdf["source"].to_numpy()
+total_mentions = len(fdf)
+unique_sources = len(set(source_values[source_values != "unknown"]))
+positive_count = int((sentiment_values == "positive").sum())
+negative_count = int((sentiment_values == "negative").sum())
+avg_risk = float(fdf["risk_score"].fillna(0).to_numpy().mean()) if total_mentions else 0.0
 with col1:
     st.metric("📊 Total Mentions", total_mentions)
 with col2:
@@ -268,88 +319,120 @@ st.markdown("---")
 # MENTIONS LIST - MAIN CONTENT
 # ─────────────────────────────
 st.subheader(f"🗞️ Latest Mentions ({len(filtered_mentions)} shown)")
-for i, mention in enumerate(filtered_mentions):
-    article = mention.get("article", {}) or {}
+# Parse every created_at once, vectorized, instead of fromisoformat per row
+if "created_at" in fdf:
+    created_hhmm = (
+        pd.to_datetime(fdf["created_at"], utc=True, errors="coerce", format="ISO8601")
+        .dt.strftime("%H:%M")
+        .fillna("")
+        .tolist()
+    )
+else:
+    created_hhmm = [""] * len(filtered_mentions)
+# Display badges for every row in one pass each (Series.map / np.select, no per-row lookups)
+sentiment_badge = (
+    fdf["sentiment"].map(SENTIMENT_EMOJI).fillna("⚪") + " "
+    + fdf["sentiment"].str.upper() + " (" + fdf["sentiment_confidence"].map("{:.2f}".format) + ")"
+).tolist()
+risk_badge = risk_badges(fdf["risk_score"]).tolist()
+
+# One table for the whole list (a single element instead of ~8 widgets per mention)
+table = pd.DataFrame({
+    "title": fdf["title"],
+    "link": fdf["link"],
+    "source": fdf["source"],
+    "sentiment": sentiment_badge,
+    "risk": risk_badge,
+    "time": created_hhmm,
+    "flagged": fdf["flagged"].astype(bool),
+})
+event = st.dataframe(
+    table,
+    hide_index=True,
+    use_container_width=True,
+    on_select="rerun",
+    selection_mode="single-row",
+    key="mentions_table",
+    column_config={
+        "title": st.column_config.TextColumn("Title", width="large"),
+        "link": st.column_config.LinkColumn("Link", display_text="Open"),
+        "source": "Source",
+        "sentiment": "Sentiment",
+        "risk": "Risk",
+        "time": "Time",
+        "flagged": st.column_config.CheckboxColumn("🚩"),
+    },
+)
+
+# Bulk journalist suggestions: every visible mention in one batch, ≤8 requests in flight.
+# Kept in session state by article id, so selecting a row (a rerun) doesn't drop them
+bulk_suggestions = st.session_state.setdefault("_bulk_suggestions", {})
+if bulk_suggest and st.button(f"🎯 Suggest all ({len(filtered_mentions)})"):
+    with st.spinner("Matching journalists..."):
+        bulk_suggestions.update(match_many({m["article_id"]: m["title"] + " " + m["summary"] for m in filtered_mentions}))
+if bulk_suggest:
+    suggestion_rows = []
+    for m in filtered_mentions:
+        if m["article_id"] not in bulk_suggestions:
+            continue
+        result = bulk_suggestions[m["article_id"]]
+        top = {} if isinstance(result, Exception) else (result or [{}])[0]
+        suggestion_rows.append({
+            "title": m["title"],
+            "journalist": top.get("name", ""),
+            "outlet": top.get("outlet", ""),
+            "score": top.get("score"),
+            "error": str(result) if isinstance(result, Exception) else "",
+        })
+    if suggestion_rows:
+        st.dataframe(suggestion_rows, hide_index=True, use_container_width=True)
+
+# Summary and Flag/Suggest actions for the selected row only (two buttons, not two per row)
+selected_rows = event.selection.rows
+if not selected_rows:
+    st.caption("Select a row to see its summary and actions.")
+else:
+    mention = filtered_mentions[selected_rows[0]]
     title = mention.get("title", "(untitled)")
     link = mention.get("link")
     source = mention.get("source", "unknown")
     summary = mention.get("summary", "")
-    sentiment = mention.get("sentiment", "neutral")
-    sentiment_confidence = mention.get("sentiment_confidence", 0.0)
-    risk_score = mention.get("risk_score", 0)
-    created_at = mention.get("created_at")
     flagged = mention.get("flagged", False)
     flag_reason = mention.get("flag_reason", "")
 
-    # Truncate long summaries
-    if summary and len(summary) > 200:
-        summary = summary[:200] + "..."
-
-    # Sentiment styling
-    sentiment_colors = {
-        "positive": "🟢",
-        "negative": "🔴",
-        "neutral": "⚪"
-    }
-    sentiment_emoji = sentiment_colors.get(sentiment, "⚪")
-
-    # Container for each mention
-    with st.container():
-        # Headline + Source
-        headline_col1, headline_col2 = st.columns([1, 6])
-        with headline_col1:
-            st.markdown(f"**{i+1}.**")
-        with headline_col2:
-            if link:
-                st.markdown(f"**🔗 [{title}]({link})**")
-                st.caption(f"*{source}*", help=link)
-            else:
-                st.markdown(f"**📄 {title}**")
-                st.caption(f"*{source}*")
-
-        # Summary
-        if summary and summary != "(No summary available)":
-            with st.expander("📝 Summary", expanded=False):
-                st.markdown(summary, unsafe_allow_html=True)
-        else:
-            st.write("📝 No summary available")
-
-        # Metrics and Actions
-        metric_col1, metric_col2, metric_col3, metric_col4 = st.columns([4, 2, 2, 2])
-        with metric_col1:
-            st.markdown(f"{sentiment_emoji} **{sentiment.upper()} ({sentiment_confidence:.2f})**")
-            if created_at:
-                st.caption(f"*{datetime.fromisoformat(created_at.replace('Z', '+00:00')):%H:%M}*")
-        with metric_col2:
-            st.markdown(f"**{format_risk(risk_score)}**")
-        with metric_col3:
-            if flagged:
-                st.markdown(f"🚩 **Flagged: {flag_reason}**")
-            elif st.button("🚩 Flag", key=f"flag-{mention['id']}"):
+    with st.container(border=True):
+        # Headline + source, then summary and badges: two markdown elements, only the actions are widgets.
+        # Link and title stay out of the HTML-enabled element; HTML is allowed for the summary only
+        row = selected_rows[0]
+        headline = f"**🔗 [{title}]({link})**" if link else f"**📄 {title}**"
+        st.markdown(f"{headline}\n\n*{source}*")
+        has_summary = summary and summary != "(No summary available)"
+        badges = f"**{sentiment_badge[row]}** | **{risk_badge[row]}**"
+        if created_hhmm[row]:
+            badges += f" | *{created_hhmm[row]}*"
+        details = [
+            f"📝 {summary}" if has_summary else "📝 No summary available",
+            badges,
+        ]
+        if flagged:
+            details.append(f"🚩 **Flagged: {html.escape(flag_reason or '')}**")
+        st.markdown("\n\n".join(details), unsafe_allow_html=True)
+
+        # Actions
+        action_col1, action_col2 = st.columns(2)
+        with action_col1:
+            if not flagged and st.button("🚩 Flag", key=f"flag-{mention['id']}"):
                 try:
-                    resp = requests.post(
-                        f"{BACKEND}/api/flag",
-                        params={"article_id": mention['article_id'], "reason": "urgent"},
-                        headers={"x-admin-token": ADMIN_TOKEN},
-                        timeout=10
-                    )
-                    resp.raise_for_status()
-                    st.success(f"✅ Flagged: {resp.json()['reason']}")
+                    st.success(f"✅ Flagged: {flag_article(mention['article_id'], ADMIN_TOKEN)['reason']}")
                     st.cache_data.clear()
                     time.sleep(0.3)
                     st.rerun()
                 except Exception as e:
                     st.error(f"Flag failed: {e}")
-        with metric_col4:
-            if st.button("🎯 Suggest Journalist", key=f"suggest-{mention['id']}"):
+        with action_col2:
+            if not bulk_suggest and st.button("🎯 Suggest Journalist", key=f"suggest-{mention['id']}"):
                 try:
-                    resp = requests.get(
-                        f"{BACKEND}/api/match",
-                        params={"text": title + " " + summary, "top_k": 3},
-                        timeout=10
-                    )
-                    resp.raise_for_status()
-                    matches = resp.json()
+                    matches = fetch_matches(title + " " + summary)
                     if matches:
                         with st.expander(f"🎯 Top {len(matches)} Journalist Matches", expanded=True):
                             for j, m in enumerate(matches, 1):
@@ -359,7 +442,6 @@ for i, mention in enumerate(filtered_mentions):
                         st.info("No journalists found in database")
                 except Exception as e:
                     st.error(f"Suggestion failed: {e}")
-        st.markdown("---")
 
 # ─────────────────────────────
 # ANALYTICS CHARTS
@@ -368,70 +450,20 @@ st.markdown("---")
 st.subheader("📈 Analytics")
 col1, col2 = st.columns(2)
 
-# Source distribution
-source_counts = {}
-for m in filtered_mentions:
-    src = m.get("source", "unknown")
-    source_counts[src] = source_counts.get(src, 0) + 1
+# Each figure is keyed on its own small aggregate, not on the filtered rows
+source_counts = tuple(fdf["source"].value_counts().head(10).items())
+sentiment_counts = tuple(fdf["sentiment"].value_counts().items())
+# ndarray straight from the column (no Python list); missing scores are left out
+risk = fdf["risk_score"].to_numpy(dtype=float, na_value=np.nan)
+risk_scores = np.sort(risk[~np.isnan(risk)])
 if source_counts:
-    source_df = pd.DataFrame([
-        {"source": src, "count": count}
-        for src, count in source_counts.items()
-    ]).sort_values("count", ascending=False).head(10)
     with col1:
-        fig_bar = px.bar(
-            source_df,
-            x="count",
-            y="source",
-            orientation="h",
-            title="🗞️ Top Sources",
-            color="count",
-            color_continuous_scale="Viridis",
-            height=400
-        )
-        fig_bar.update_layout(margin={"t": 40, "b": 20, "l": 0, "r": 0})
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-# Sentiment pie
-sentiment_counts = {}
-for m in filtered_mentions:
-    sent = m.get("sentiment", "unknown")
-    sentiment_counts[sent] = sentiment_counts.get(sent, 0) + 1
+        st.plotly_chart(build_source_bar(source_counts), use_container_width=True)
 if sentiment_counts:
-    sentiment_df = pd.DataFrame([
-        {"sentiment": sent, "count": count}
-        for sent, count in sentiment_counts.items()
-    ])
     with col2:
-        fig_pie = px.pie(
-            sentiment_df,
-            values="count",
-            names="sentiment",
-            title="😊 Sentiment Distribution",
-            color_discrete_map={
-                "positive": "#10B981",
-                "negative": "#EF4444",
-                "neutral": "#6B7280",
-                "unknown": "#9CA3AF"
-            }
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
-
-# Risk distribution histogram
-risk_scores = [m.get("risk_score", 0) for m in filtered_mentions if m.get("risk_score") is not None]
-if risk_scores:
-    risk_df = pd.DataFrame({"risk_score": risk_scores})
-    fig_hist = px.histogram(
-        risk_df,
-        x="risk_score",
-        nbins=20,
-        title="⚠️ Risk Score Distribution",
-        labels={"risk_score": "Risk Score"},
-        color_discrete_sequence=["#3B82F6"],
-        color="risk_score",
-        color_continuous_scale=["#10B981", "#F59E0B", "#EF4444"]
-    )
-    st.plotly_chart(fig_hist, use_container_width=True)
+        st.plotly_chart(build_sentiment_pie(sentiment_counts), use_container_width=True)
+if risk_scores.size:
+    st.plotly_chart(build_risk_hist(risk_scores), use_container_width=True)
 
 # Footer
 st.markdown("---")